@@ -1,13 +1,17 @@
 import subprocess
 import sys
-import json
+import io
 import re
 import threading
+import queue
 import time
 import math
+import functools
 import os
 import signal
 from pathlib import Path
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import tkinter as tk
 from tkinter import ttk, messagebox
 from PIL import Image, ImageTk, ImageFilter, ImageDraw
@@ -30,6 +34,7 @@ CACHE_DIR.mkdir(parents=True, exist_ok=True)
 LOW_END_MODE = False
 BLUR_RADIUS = 40
 ENABLE_TRANSPARENCY = not LOW_END_MODE
+MAX_WORKERS = 3
 
 
 STAGE_ICONS = {
@@ -45,14 +50,79 @@ STATUS_TEXT = {
 }
 
 SIZE_MULT = {"KiB": 1024, "MiB": 1024**2, "GiB": 1024**3}
+_INV_MIB = 1.0 / 1048576
+_DURATION_UNITS = (("hr", "hrs"), ("min", "mins"), ("sec", "secs"))
+
+_LAST_TS = [0, ""]
+
+_PROG_RE = re.compile(
+    r'(?P<pct>\d+(?:\.\d+)?)%'
+    r'|of\s+~?\s*(?P<size_val>[\d.]+)\s*(?P<size_unit>KiB|MiB|GiB)'
+    r'|at\s+(?P<spd_val>[\d.]+)\s*(?P<spd_unit>KiB|MiB|GiB)/s'
+)
+_CLEAN_RE = re.compile(r'[<>:"/\\|?*]')
+
+# At most one call per `interval` seconds; the latest dropped call is replayed via after().
+def throttle(interval):
+    def decorator(func):
+        last = [0.0]
+        pending = [None]
+        lock = threading.Lock()
+
+        def flush(self):
+            with lock:
+                args = pending[0]
+                pending[0] = None
+                if args is None:
+                    return
+                last[0] = time.monotonic()
+            func(self, *args)
+
+        @functools.wraps(func)
+        def wrapper(self, *args):
+            with lock:
+                now = time.monotonic()
+                remaining = interval - (now - last[0])
+                if remaining <= 0:
+                    last[0] = now
+                    pending[0] = None
+                else:
+                    armed = pending[0] is not None
+                    pending[0] = args
+                    if armed:
+                        return
+            if remaining <= 0:
+                func(self, *args)
+                return
+            try:
+                self.after(int(remaining * 1000) + 1, flush, self)
+            except Exception:
+                pending[0] = None
+
+        return wrapper
+    return decorator
 
+def _ts():
+    now = int(time.time())
+    if now != _LAST_TS[0]:
+        _LAST_TS[:] = [now, time.strftime("%H:%M:%S", time.localtime(now))]
+    return _LAST_TS[1]
+
+# Module-level targets for after(ms, func, *args), so GUI updates don't allocate a lambda each.
+def _set_text(widget, text):
+    widget.config(text=text)
+
+def _set_value(widget, value):
+    widget.config(value=value)
+
+@functools.lru_cache(maxsize=4096)
 def clean_name(name):
     if not name:
         return "Unknown"
    
     name = str(name)
     name = name.replace("#", "")
-    name = re.sub(r'[<>:"/\\|?*]', "", name)
+    name = _CLEAN_RE.sub("", name)
     return name.strip().rstrip(".")
 
 def format_duration(seconds):
@@ -62,14 +132,17 @@ def format_duration(seconds):
         seconds = int(seconds)
     except ValueError:
         return "—"
-    hrs = seconds // 3600
-    mins = (seconds % 3600) // 60
-    secs = seconds % 60
-    parts = []
-    if hrs: parts.append(f"{hrs} hr{'s' if hrs != 1 else ''}")
-    if mins: parts.append(f"{mins} min{'s' if mins != 1 else ''}")
-    if secs or not parts: parts.append(f"{secs} sec{'s' if secs != 1 else ''}")
-    return " ".join(parts)
+    return _format_seconds(seconds)
+
+@functools.lru_cache(maxsize=4096)
+def _format_seconds(seconds):
+    hrs, rem = divmod(seconds, 3600)
+    mins, secs = divmod(rem, 60)
+    shown = (hrs, mins, secs or not (hrs or mins))
+    return " ".join(
+        f"{n} {units[n != 1]}"
+        for n, units, show in zip((hrs, mins, secs), _DURATION_UNITS, shown) if show
+    )
 
 def get_playlist_info(url):
 
@@ -80,38 +153,50 @@ def get_playlist_info(url):
 
     try:
         proc = subprocess.run(
-            [sys.executable, "-m", "yt_dlp", "--dump-single-json", "--flat-playlist", url],
-            capture_output=True, text=True, encoding='utf-8', errors="replace",
-            startupinfo=startupinfo
+            [sys.executable, "-m", "yt_dlp", "--flat-playlist",
+             "--print", "%(id)s\t%(title|)s", "--print", "playlist:\t%(title|)s",
+             "--encoding", "utf-8", url],
+            capture_output=True, startupinfo=startupinfo
         )
     except FileNotFoundError:
         raise RuntimeError("Python or yt-dlp module not found.")
 
-    if proc.returncode != 0 or not proc.stdout.strip():
+    if proc.returncode != 0:
     
-        err = proc.stderr or "yt-dlp failed to fetch info"
-        raise RuntimeError(err.strip())
-
+        err = proc.stderr.decode('utf-8', errors="replace").strip()
+        raise RuntimeError(err or "yt-dlp failed to fetch info")
+
+    # One "<video id>\t<song title>" line per entry, then "\t<playlist title>" once at the end.
+    # Split the bytes first: str.splitlines() would also break titles on U+2028, \x1c, etc.
+    # A track listed twice is kept once, so two yt-dlp processes never write the same output file.
+    pl_title = None
+    songs = []
+    seen_ids = set()
+    for raw in proc.stdout.splitlines():
+        video_id, sep, title = raw.decode('utf-8', errors="replace").partition("\t")
+        if not sep:
+            continue
+        if not video_id:
+            pl_title = title
+        elif title and video_id not in seen_ids:
+            seen_ids.add(video_id)
+            songs.append((clean_name(title), video_id))
+
+    return clean_name(pl_title or "Unknown Playlist"), songs
+
+def _pump_lines(stream, lines):
     try:
-        data = json.loads(proc.stdout)
-    except json.JSONDecodeError:
-        raise RuntimeError("Failed to parse playlist JSON.")
-
-    entries = data.get("entries") or []
-   
-    pl_title = clean_name(data.get("title", "Unknown Playlist"))
-    song_titles = [clean_name(e.get("title")) for e in entries if e and e.get("title")]
-    return pl_title, song_titles
+        for line in iter(stream.readline, ""):
+            lines.put(line)
+    except (OSError, ValueError):
+        pass
 
-def download_song(song, playlist_dir, progress_cb, stage_cb, stop_check_cb=None):
-    safe_song = re.escape(song)
- 
+def download_song(song, video_id, playlist_dir, progress_cb, stage_cb, stop_check_cb=None):
     cmd = [
-        sys.executable, "-m", "yt_dlp", PLAYLIST_URL,
+        sys.executable, "-m", "yt_dlp", f"https://music.youtube.com/watch?v={video_id}",
         "--newline",
         "--extract-audio", "--audio-format", "mp3",
         "--audio-quality", "0",
-        "--match-title", safe_song,
         "-o", str(playlist_dir / "%(title)s.%(ext)s"),
         "--encoding", "utf-8"
     ]
@@ -132,18 +217,23 @@ def download_song(song, playlist_dir, progress_cb, stage_cb, stop_check_cb=None)
         
         proc = subprocess.Popen(
             cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
-            text=True, encoding='utf-8', errors="replace", bufsize=1,
-            startupinfo=startupinfo
+            bufsize=65536, startupinfo=startupinfo
         )
     except Exception as e:
         stage_cb(f"Launch error: {e}", "error")
         return False
 
+    stdout = io.TextIOWrapper(proc.stdout, encoding='utf-8', errors="replace", newline='')
+    lines = queue.Queue()
+    reader = threading.Thread(target=_pump_lines, args=(stdout, lines), daemon=True)
+    reader.start()
+
     stage_cb("Downloading banner", "download")
 
     total_bytes = None
     last_pct = None
-    speed_samples = []
+    speed_samples = deque(maxlen=10)
+    speed_sum = 0.0
     saw_progress = False
     phase = "banner"
 
@@ -154,9 +244,10 @@ def download_song(song, playlist_dir, progress_cb, stage_cb, stop_check_cb=None)
                 proc.terminate()
                 return False
 
-            line = proc.stdout.readline()
-            if not line:
-                if proc.poll() is not None:
+            try:
+                line = lines.get(timeout=0.2)
+            except queue.Empty:
+                if not reader.is_alive() and lines.empty() and proc.poll() is not None:
                     break
                 continue
 
@@ -168,20 +259,25 @@ def download_song(song, playlist_dir, progress_cb, stage_cb, stop_check_cb=None)
                 continue
 
             
-            size = re.search(r'of\s+~?([\d.]+)\s*(KiB|MiB|GiB)', line)
-            done = re.search(r'(\d+(?:\.\d+)?)%', line)
-            speed = re.search(r'at\s+([\d\.]+)\s*(KiB|MiB|GiB)/s', line)
+            size = done = speed = None
+            for m in _PROG_RE.finditer(line):
+                if m.group("pct") is not None:
+                    done = done or m
+                elif m.group("size_val") is not None:
+                    size = size or m
+                else:
+                    speed = speed or m
 
             if size:
                 try:
-                    total_bytes = float(size.group(1)) * SIZE_MULT.get(size.group(2), 1024**2)
+                    total_bytes = float(size.group("size_val")) * SIZE_MULT.get(size.group("size_unit"), 1024**2)
                 except ValueError:
                     pass
 
             if done:
                 saw_progress = True
                 try:
-                    pct = float(done.group(1))
+                    pct = float(done.group("pct"))
                 except ValueError:
                     pct = 0.0
                 
@@ -202,10 +298,12 @@ def download_song(song, playlist_dir, progress_cb, stage_cb, stop_check_cb=None)
 
                 if speed:
                     try:
-                        spd = float(speed.group(1)) * SIZE_MULT.get(speed.group(2), 1024**2)
+                        spd = float(speed.group("spd_val")) * SIZE_MULT.get(speed.group("spd_unit"), 1024**2)
+                        if len(speed_samples) == speed_samples.maxlen:
+                            speed_sum -= speed_samples[0]
                         speed_samples.append(spd)
-                        if len(speed_samples) > 10: speed_samples.pop(0)
-                        avg_speed = sum(speed_samples) / len(speed_samples)
+                        speed_sum += spd
+                        avg_speed = max(speed_sum, 0.0) / len(speed_samples)
                     except ValueError:
                         avg_speed = 0
                 else:
@@ -215,7 +313,8 @@ def download_song(song, playlist_dir, progress_cb, stage_cb, stop_check_cb=None)
                 eta = (remaining / avg_speed) if (avg_speed and avg_speed > 0 and remaining) else 0
 
                 
-                if pct != last_pct:
+                # Sub-0.5% steps are below what the bar animation can show; 100% always goes out.
+                if last_pct is None or abs(pct - last_pct) >= 0.5 or (pct >= 100 and pct != last_pct):
                     last_pct = pct
                     progress_cb(song, pct, downloaded, total_bytes, avg_speed, eta)
 
@@ -264,12 +363,24 @@ class App(tk.Tk):
         self.current_icon = None
         self.icon_pulse = False
         self.pulse_running = False
-        self.pulse_tag = None
         
         self.target_playlist_pct = 0.0
         self.current_playlist_pct = 0.0
         self.target_song_pct = 0.0
         self.current_song_pct = 0.0
+        self.anim_armed = False
+        self.anim_lock = threading.Lock()
+
+        # Playlist entry indexes in flight, oldest first; the first one owns the song bar/label.
+        # song_pcts only ever grows (it feeds pct_sum); live_pcts is what the song bar shows.
+        self.active_songs = []
+        self.song_pcts = {}
+        self.live_pcts = {}
+        self.song_titles = {}
+        self.title_locks = {}
+        self.pct_sum = 0.0
+        self.total_songs = 0
+        self.song_lock = threading.Lock()
 
         style = ttk.Style(self)
         style.theme_use("default")
@@ -324,7 +435,7 @@ class App(tk.Tk):
         self.setup_tags()
 
         threading.Thread(target=self.run, daemon=True).start()
-        self.animate_bars()
+        self.kick_animation()
 
         self.status_badge.lift()
         self.bind("<Configure>", lambda e: self.status_badge.lift())
@@ -379,14 +490,14 @@ class App(tk.Tk):
 
     def _create_vignette(self, path):
         width, height = 780, 580
-        vignette = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+        # Build the vertical gradient as a 1px column and stretch it, instead of one draw.line per row.
+        column = Image.new("RGBA", (1, height))
+        column.putdata([
+            (int(20 * (1 - y/height)), int(20 * (1 - y/height)), int(24 * (1 - y/height)), 255)
+            for y in range(height)
+        ])
+        vignette = column.resize((width, height), Image.NEAREST)
         draw = ImageDraw.Draw(vignette)
-        
-        for y in range(height):
-            r = int(20 * (1 - y/height))
-            g = int(20 * (1 - y/height))
-            b = int(24 * (1 - y/height))
-            draw.line([(0, y), (width, y)], fill=(r, g, b, 255))
 
         for i in range(250):
             alpha = int(150 * (i / 250))
@@ -409,6 +520,9 @@ class App(tk.Tk):
         self.terminal.tag_config("error", foreground="#ff4444", font=("Consolas", 10, "bold"))
         self.terminal.tag_config("retry", foreground="#ffaa00", font=("Consolas", 10, "bold"))
         self.terminal.tag_config("warn", foreground="#ff8888", font=("Consolas", 10, "bold"))
+        # Shared pulse tags: "pulse_active" only ever covers the newest line.
+        self.terminal.tag_config("pulse_rest", font=("Consolas", 10, "bold"))
+        self.terminal.tag_config("pulse_active", font=("Consolas", 10, "bold"))
 
     def set_status(self, tag):
         if not self.is_running: return
@@ -416,26 +530,23 @@ class App(tk.Tk):
         if text:
             
             try:
-                self.after(0, lambda: self.status_badge.config(text=text))
+                self.after(0, _set_text, self.status_badge, text)
             except Exception: pass
 
     def pulse_icon(self):
         if not self.is_running: return
         
-        if not self.current_icon or not self.pulse_tag or self.pulse_running:
+        if not self.current_icon or self.pulse_running:
             return
+        # One loop for the session: it always pulses whichever line holds "pulse_active".
         self.pulse_running = True
-        current_tag = self.pulse_tag
 
         def _pulse():
             if not self.is_running: return
-            if self.pulse_tag != current_tag:
-                self.pulse_running = False
-                return
             self.icon_pulse = not self.icon_pulse
             size = 11 if self.icon_pulse else 10
             try:
-                self.terminal.tag_config(current_tag, font=("Consolas", size, "bold"))
+                self.terminal.tag_config("pulse_active", font=("Consolas", size, "bold"))
                 self.after(400, _pulse)
             except Exception: pass
 
@@ -444,34 +555,30 @@ class App(tk.Tk):
     def log(self, text, tag="info"):
         if not self.is_running: return
         
-        ts = time.strftime("%H:%M:%S")
+        ts = _ts()
+        icon = STAGE_ICONS.get(tag, "")
         
-        def _log_main_thread():
-            if not self.is_running: return
-            try:
-               
-                icon = STAGE_ICONS.get(tag, "")
-                if icon:
-                    self.current_icon = icon
-                
-              
-                pulse_tag = f"pulse_{int(time.time()*1000)}"
-                self.pulse_tag = pulse_tag
-                self.terminal.tag_config(pulse_tag, font=("Consolas", 10, "bold"))
-                
-                self.terminal.configure(state="normal")
-                if tag == "song":
-                    self.terminal.insert("end", f"[{ts}] {icon} {text}\n", ("song",))
-                else:
-                    self.terminal.insert("end", f"[{ts}] {icon} {text}\n", (tag, pulse_tag))
-                self.terminal.see("end")
-                self.terminal.configure(state="disabled")
-            except Exception: pass
-
         self.set_status(tag)
-        self.after(0, _log_main_thread)
+        self.after(0, self.append_log, ts, icon, text, tag)
         self.after(100, self.pulse_icon)
 
+    def append_log(self, ts, icon, text, tag):
+        if not self.is_running: return
+        try:
+            if icon:
+                self.current_icon = icon
+            
+            self.terminal.tag_remove("pulse_active", "1.0", "end")
+            
+            self.terminal.configure(state="normal")
+            if tag == "song":
+                self.terminal.insert("end", f"[{ts}] {icon} {text}\n", ("song",))
+            else:
+                self.terminal.insert("end", f"[{ts}] {icon} {text}\n", (tag, "pulse_rest", "pulse_active"))
+            self.terminal.see("end")
+            self.terminal.configure(state="disabled")
+        except Exception: pass
+
     def animate_bars(self):
         if not self.is_running: return
         try:
@@ -491,8 +598,30 @@ class App(tk.Tk):
                 self.current_song_pct = self.target_song_pct
                 self.song_bar.config(value=self.target_song_pct)
 
-            self.after(20, self.animate_bars)
-        except Exception: pass
+            if abs(diff_p) > 0.1 or abs(diff_s) > 0.1:
+                self.after(30, self.animate_bars)
+            else:
+                with self.anim_lock:
+                    self.anim_armed = False
+                # A target may have moved while we were settling.
+                if (self.target_playlist_pct != self.current_playlist_pct
+                        or self.target_song_pct != self.current_song_pct):
+                    self.kick_animation()
+        except Exception:
+            with self.anim_lock:
+                self.anim_armed = False
+
+    def kick_animation(self):
+        # Called from the pool threads too; the lock keeps it to a single animate_bars loop.
+        if not self.is_running: return
+        with self.anim_lock:
+            if self.anim_armed: return
+            self.anim_armed = True
+        try:
+            self.after(30, self.animate_bars)
+        except Exception:
+            with self.anim_lock:
+                self.anim_armed = False
 
     def update_ring(self, progress, eta):
         if not self.is_running: return
@@ -504,9 +633,87 @@ class App(tk.Tk):
             self.ring.create_text(45, 45, text=format_duration(eta), fill="white", font=("Segoe UI", 8, "bold"))
         except Exception: pass
 
+    @throttle(0.1)
+    def show_progress(self, text):
+        if not self.is_running: return
+        try:
+            self.after(0, _set_text, self.progress_line, text)
+        except Exception: pass
+
     def check_stop(self):
         return not self.is_running
 
+    def show_song(self, song, pct=0.0):
+        self.after(0, _set_text, self.song_label, song)
+        self.target_song_pct = pct
+        self.current_song_pct = pct
+        self.after(0, _set_value, self.song_bar, pct)
+
+    def song_callbacks(self, entry, song):
+        def stage_cb(text, tag): self.log(f"{song}: {text}", tag)
+
+        def progress_cb(s, pct, done, total_b, speed, eta):
+            if not self.is_running: return
+            with self.song_lock:
+                if entry in self.song_pcts:
+                    best = max(pct, self.song_pcts[entry])
+                    self.pct_sum += best - self.song_pcts[entry]
+                    self.song_pcts[entry] = best
+                self.live_pcts[entry] = pct
+                focused = bool(self.active_songs) and self.active_songs[0] == entry
+                playlist_pct = self.pct_sum / self.total_songs if self.total_songs else 0
+
+            self.target_playlist_pct = playlist_pct
+            if focused:
+                mb_done = done * _INV_MIB
+                mb_total = total_b * _INV_MIB if total_b else 0
+                spd = f"{speed * _INV_MIB:.2f} MB/s" if speed else "—"
+
+                self.target_song_pct = pct
+                self.show_progress(f"{mb_done:.2f}/{mb_total:.2f} MB   {spd}   Song ETA {format_duration(eta)}")
+            self.kick_animation()
+
+        return progress_cb, stage_cb
+
+    def download_one(self, entry, song, video_id, playlist_dir):
+        if not self.is_running: return False
+
+        # Same title means same output file, so entries sharing a title run one after another.
+        with self.song_lock:
+            title_lock = self.title_locks.setdefault(song, threading.Lock())
+        with title_lock:
+            if not self.is_running: return False
+            return self._download_entry(entry, song, video_id, playlist_dir)
+
+    def _download_entry(self, entry, song, video_id, playlist_dir):
+        with self.song_lock:
+            self.active_songs.append(entry)
+            self.song_titles[entry] = song
+            self.song_pcts.setdefault(entry, 0.0)
+            self.live_pcts[entry] = 0.0
+            focused = self.active_songs[0] == entry
+        if focused:
+            self.show_song(song)
+        self.log(f"{song}", "song")
+
+        progress_cb, stage_cb = self.song_callbacks(entry, song)
+        start_time = time.time()
+        try:
+            return download_song(song, video_id, playlist_dir, progress_cb, stage_cb, self.check_stop)
+        finally:
+            self.song_times.append(time.time() - start_time)
+            with self.song_lock:
+                was_focused = self.active_songs[0] == entry
+                self.active_songs.remove(entry)
+                self.pct_sum += 100.0 - self.song_pcts[entry]
+                self.song_pcts[entry] = 100.0
+                next_entry = self.active_songs[0] if was_focused and self.active_songs else None
+                if next_entry is not None:
+                    next_song = self.song_titles[next_entry]
+                    next_pct = self.live_pcts[next_entry]
+            if next_entry is not None:
+                self.show_song(next_song, next_pct)
+
     def run(self):
         try:
             playlist_name, songs = get_playlist_info(PLAYLIST_URL)
@@ -528,54 +735,37 @@ class App(tk.Tk):
             return
 
         total = len(songs)
-        self.after(0, lambda: self.header.config(text=f"Downloading • {playlist_name}"))
-
-        for i, song in enumerate(songs, 1):
-            if not self.is_running: break
-            
-            start_time = time.time()
-
-            self.after(0, lambda s=song: self.song_label.config(text=s))
-            self.target_song_pct = 0
-            self.current_song_pct = 0 
-            self.after(0, lambda: self.song_bar.config(value=0))
-            
-            self.log(f"{song}", "song")
+        self.total_songs = total
+        self.after(0, _set_text, self.header, f"Downloading • {playlist_name}")
 
-            def stage_cb(text, tag): self.log(text, tag)
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+            futures = {
+                ex.submit(self.download_one, entry, song, video_id, playlist_dir): song
+                for entry, (song, video_id) in enumerate(songs)
+            }
 
-            def progress_cb(s, pct, done, total_b, speed, eta):
-                if not self.is_running: return
-                mb_done = done / 1024 / 1024
-                mb_total = total_b / 1024 / 1024 if total_b else 0
-                spd = f"{speed/1024/1024:.2f} MB/s" if speed else "—"
-                
-                self.target_song_pct = pct
-                
+            for i, fut in enumerate(as_completed(futures), 1):
+                song = futures[fut]
                 try:
-                    self.after(0, lambda: self.progress_line.config(
-                        text=f"{mb_done:.2f}/{mb_total:.2f} MB   {spd}   Song ETA {format_duration(eta)}"
-                    ))
-                except Exception: pass
+                    ok = fut.result()
+                except Exception as e:
+                    self.log(f"{song}: {e}", "error")
+                    ok = False
+                if not ok:
+                    self.failed_songs.append(song)
 
-           
-            ok = download_song(song, playlist_dir, progress_cb, stage_cb, self.check_stop)
-            if not ok:
-                self.failed_songs.append(song)
+                avg = sum(self.song_times) / len(self.song_times) if self.song_times else 0
+                remaining = total - i
+                playlist_eta = avg * math.ceil(remaining / MAX_WORKERS)
+                progress = (i / total) * 100
 
-            duration = time.time() - start_time
-            self.after(0, lambda d=duration: self.song_times.append(d))
+                with self.song_lock:
+                    self.target_playlist_pct = self.pct_sum / total
+                self.kick_animation()
+                self.after(0, self.update_ring, progress, playlist_eta)
 
-            avg = sum(self.song_times) / len(self.song_times) if self.song_times else 0
-            remaining = total - i
-            playlist_eta = avg * remaining
-            progress = (i / total) * 100
-            
-            self.target_playlist_pct = progress
-            self.after(0, lambda p=progress, e=playlist_eta: self.update_ring(p, e))
-            
-            if ok:
-                self.log(f"Finished {song}", "done")
+                if ok:
+                    self.log(f"Finished {song}", "done")
 
         if not self.is_running: return
 
@@ -583,20 +773,21 @@ class App(tk.Tk):
 
       
         try:
-            existing_files = {f.stem for f in playlist_dir.glob("*.mp3")}
+            with os.scandir(playlist_dir) as it:
+                existing_files = {e.name[:-4] for e in it if e.name.endswith(".mp3")}
         except OSError:
             existing_files = set()
 
-        missing = [s for s in songs if s not in existing_files]
+        missing = [(i, s, v) for i, (s, v) in enumerate(songs) if s not in existing_files]
 
         if missing:
             self.log(f"{len(missing)} missing — retrying…", "retry")
             still_missing = []
 
-            for song in missing:
+            for entry, song, video_id in missing:
                 if not self.is_running: break
                 self.log(f"Retrying {song}", "retry")
-                ok = download_song(song, playlist_dir, progress_cb, stage_cb, self.check_stop)
+                ok = self.download_one(entry, song, video_id, playlist_dir)
                 if not ok:
                     still_missing.append(song)
 